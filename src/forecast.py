@@ -4,7 +4,7 @@ Forecast jumlah penumpang kereta api per kategori menggunakan tren linier sederh
 Fitur:
 - Load CSV dengan encoding 'utf-8-sig' (menghapus BOM jika ada)
 - Transformasi dari format wide (kolom bulan) ke long time series
-- Estimasi tren linier per kategori (sklearn LinearRegression)
+- Estimasi tren linier per kategori (OLS closed-form)
 - Prediksi 1..H bulan ke depan (default 3)
 - Klasifikasi arah prediksi (naik/turun/tetap) relatif terhadap bulan terakhir aktual
 - Ekspor ringkasan ke output/forecast_summary.csv
@@ -19,16 +19,20 @@ Catatan:
 """
 
 import argparse
+import hashlib
 import os
 import re
 from typing import List, Tuple, Dict, Optional
 
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import r2_score
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+from joblib import Parallel, delayed
+
+# matplotlib/seaborn diimpor lazy di _get_fig_ax: pemakaian tanpa plotting
+# (mis. scripting fit/forecast saja) tidak membayar cold-start importnya
 
 
 INDO_MONTHS = [
@@ -46,6 +50,11 @@ INDO_MONTHS = [
     "Desember",
 ]
 
+# Pola regex yang dipakai helper hot-path, dikompilasi sekali saat import
+_SANITIZE_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_SANITIZE_DASHES = re.compile(r"-+")
+_YEAR_RE = re.compile(r"(20\d{2})")
+
 NEXT_MONTHS_MAP = {
     1: "Jan",
     2: "Feb",
@@ -74,7 +83,16 @@ def load_and_transform(input_path: str, year: int = 2024) -> pd.DataFrame:
     Load CSV dan transformasi ke format long.
     Output kolom: ['tipe_kendaraan', 'bulan', 'month_num', 'tanggal', 'jumlah']
     """
-    df = pd.read_csv(input_path, encoding="utf-8-sig")
+    # Parser pyarrow: parsing native + skema eksplisit, tanpa inferensi tipe
+    # per elemen. Tanda '-' pada bulan tanpa data dibaca sebagai NaN.
+    df = pd.read_csv(
+        input_path,
+        encoding="utf-8-sig",
+        engine="pyarrow",
+        dtype_backend="pyarrow",
+        dtype={m: "float64" for m in INDO_MONTHS},
+        na_values=["-"],
+    )
     df.columns = [_strip_bom_and_clean(c) for c in df.columns]
 
     # Identifikasi kolom kategori (asumsikan kolom pertama)
@@ -95,28 +113,41 @@ def load_and_transform(input_path: str, year: int = 2024) -> pd.DataFrame:
     if drop_cols:
         df = df.drop(columns=drop_cols)
 
-    # Melt ke long format
-    long_df = df.melt(
-        id_vars=["tipe_kendaraan"],
-        value_vars=bulan_kolom,
-        var_name="bulan",
-        value_name="jumlah",
+    # Ke long format langsung dari array NumPy (lebih ringan daripada melt:
+    # satu ravel atas blok nilai + repeat/tile untuk kolom indeks)
+    values = df[bulan_kolom].to_numpy(dtype="float64")
+    n_rows, n_months = values.shape
+    jumlah = values.ravel()
+    tipe = np.repeat(df["tipe_kendaraan"].to_numpy(), n_months)
+    # Kode Categorical (lookup C-level atas kode integer) menggantikan
+    # mapping dict per elemen
+    bulan = pd.Categorical(
+        np.tile(np.array(bulan_kolom), n_rows),
+        categories=INDO_MONTHS,
+        ordered=True,
     )
+    month_num = bulan.codes.astype("int64") + 1
 
-    # Konversi jumlah ke numerik
-    long_df["jumlah"] = pd.to_numeric(long_df["jumlah"], errors="coerce")
-
-    # Urut bulan sesuai urutan Indonesia
-    month_map = {m: i + 1 for i, m in enumerate(INDO_MONTHS)}
-    long_df["month_num"] = long_df["bulan"].map(month_map)
+    # Buat tanggal (pakai tanggal 1 setiap bulan) langsung sebagai
+    # datetime64 via aritmetika bulan sejak epoch, tanpa jalur perakitan
+    # dict milik pd.to_datetime
+    tanggal = ((year - 1970) * 12 + (month_num - 1)).astype("datetime64[M]").astype(
+        "datetime64[ns]"
+    )
 
-    # Buat tanggal (pakai tanggal 1 setiap bulan)
-    long_df["tanggal"] = pd.to_datetime(
-        {"year": year, "month": long_df["month_num"], "day": 1}, errors="coerce"
+    long_df = pd.DataFrame(
+        {
+            "tipe_kendaraan": tipe,
+            "bulan": bulan,
+            "jumlah": jumlah,
+            "month_num": month_num,
+            "tanggal": tanggal,
+        }
     )
 
-    # Buang baris invalid
-    long_df = long_df.dropna(subset=["jumlah", "month_num", "tanggal"]).copy()
+    # Buang baris invalid (masker boolean, tanpa dropna+copy); tanggal
+    # hasil aritmetika di atas selalu valid
+    long_df = long_df[~np.isnan(jumlah)]
 
     # Urutkan
     long_df = long_df.sort_values(["tipe_kendaraan", "month_num"]).reset_index(
@@ -130,7 +161,7 @@ def infer_year_from_filename(path: str) -> Optional[int]:
     Coba infer tahun dari nama file, misal: '... 2024.csv' -> 2024.
     """
     base = os.path.basename(path)
-    m = re.search(r"(20\d{2})", base)
+    m = _YEAR_RE.search(base)
     if m:
         y = int(m.group(1))
         if 1900 <= y <= 2100:
@@ -176,71 +207,94 @@ def load_and_transform_multi(
     paths: List[str],
     years: Optional[List[int]] = None,
     default_year: Optional[int] = None,
+    cache_dir: Optional[str] = None,
 ) -> pd.DataFrame:
     """
     Load banyak CSV dan gabungkan ke long time series lintas tahun.
     Setiap file di-assign tahun sesuai argumen/hasil infer, lalu dikonversi
     menggunakan load_and_transform(..., year=...).
+
+    Jika cache_dir diberikan, hasil transformasi di-cache ke parquet dengan
+    kunci mtime+ukuran file (plus tahun), sehingga run berulang atas input
+    yang sama melewati parse CSV + transformasi.
     """
     if not paths:
         raise ValueError("Daftar input kosong.")
 
     norm_years = _normalize_years_for_inputs(paths, years, default_year)
+
+    cache_path: Optional[str] = None
+    if cache_dir is not None:
+        key_src = (
+            b"".join(
+                f"{p}:{os.stat(p).st_mtime_ns}:{os.stat(p).st_size}".encode()
+                for p in paths
+            )
+            + str(norm_years).encode()
+        )
+        key = hashlib.blake2b(key_src).hexdigest()[:16]
+        cache_path = os.path.join(cache_dir, f".cache_{key}.parquet")
+        if os.path.exists(cache_path):
+            return pd.read_parquet(cache_path)
+
     frames: List[pd.DataFrame] = []
     for p, y in zip(paths, norm_years):
         df_i = load_and_transform(p, year=y)
         frames.append(df_i)
 
     df_all = pd.concat(frames, ignore_index=True)
+    # Categorical: groupby/pivot/sort bekerja atas kode integer, bukan
+    # hashing string per baris
+    df_all["tipe_kendaraan"] = df_all["tipe_kendaraan"].astype("category")
     # Pastikan urutan global per kategori adalah kronologis lintas tahun
     df_all = df_all.sort_values(["tipe_kendaraan", "tanggal"]).reset_index(drop=True)
+
+    if cache_path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        df_all.to_parquet(cache_path)
     return df_all
 
 
 def _fit_linear_trend(y: np.ndarray) -> Tuple[float, float, float]:
     """
-    Fit tren linier y ~ a + b*t, t = 1..n.
+    Fit tren linier y ~ a + b*t, t = 1..n (OLS closed-form).
     Return: (intercept a, slope b, r2)
     """
     n = len(y)
-    t = np.arange(1, n + 1).reshape(-1, 1)
-    model = LinearRegression()
-    model.fit(t, y)
-    y_hat = model.predict(t)
-    r2 = r2_score(y, y_hat) if n >= 2 else 1.0
-    return float(model.intercept_), float(model.coef_[0]), float(r2)
-
-
-def _predict_future(a: float, b: float, n: int, horizon: int) -> List[float]:
+    t = np.arange(1, n + 1, dtype=float)
+    t_mean = t.mean()
+    y_mean = y.mean()
+    b = ((t - t_mean) * (y - y_mean)).sum() / ((t - t_mean) ** 2).sum()
+    a = y_mean - b * t_mean
+    ss_res = ((y - (a + b * t)) ** 2).sum()
+    ss_tot = ((y - y_mean) ** 2).sum()
+    r2 = 1.0 - ss_res / ss_tot if n >= 2 and ss_tot > 0 else 1.0
+    return float(a), float(b), float(r2)
+
+
+def _classify_directions_vec(
+    last_actuals: np.ndarray, next_preds: np.ndarray
+) -> np.ndarray:
     """
-    Prediksi ke depan: t = n+1..n+horizon untuk y = a + b*t
+    Klasifikasi arah untuk semua kategori sekaligus: 'naik' jika prediksi
+    jelas naik, 'turun' jika jelas turun, selain itu 'tetap'.
+    Gunakan ambang toleransi relatif 0.5% dari last_actual dengan minimum
+    absolut 10.
     """
-    future_t = np.arange(n + 1, n + horizon + 1)
-    preds = a + b * future_t
-    return preds.tolist()
-
-
-def _classify_direction(last_actual: float, next_pred: float) -> str:
-    """
-    Klasifikasi arah: 'naik' jika prediksi jelas naik, 'turun' jika jelas turun, selain itu 'tetap'.
-    Gunakan ambang toleransi relatif 0.5% dari last_actual dengan minimum absolut 10.
-    """
-    if pd.isna(last_actual) or pd.isna(next_pred):
-        return "tidak diketahui"
-
-    tol = max(0.005 * abs(last_actual), 10.0)
-    if next_pred > last_actual + tol:
-        return "naik"
-    elif next_pred < last_actual - tol:
-        return "turun"
-    else:
-        return "tetap"
+    tol = np.maximum(0.005 * np.abs(last_actuals), 10.0)
+    conds = [
+        np.isnan(last_actuals) | np.isnan(next_preds),
+        next_preds > last_actuals + tol,
+        next_preds < last_actuals - tol,
+    ]
+    choices = ["tidak diketahui", "naik", "turun"]
+    return np.select(conds, choices, default="tetap")
 
 
 def _sanitize_filename(name: str) -> str:
     name = name.strip().lower()
-    name = re.sub(r"[^a-z0-9]+", "-", name)
-    name = re.sub(r"-+", "-", name).strip("-")
+    name = _SANITIZE_NON_ALNUM.sub("-", name)
+    name = _SANITIZE_DASHES.sub("-", name).strip("-")
     return name or "kategori"
 
 
@@ -249,132 +303,227 @@ def _month_labels_after(last_date: pd.Timestamp, horizon: int) -> List[str]:
     Buat label singkat untuk bulan prediksi setelah last_date.
     Contoh: last_date=2024-12-01, horizon 3 => ['2025-Jan', '2025-Feb', '2025-Mar']
     """
-    labels = []
-    y = int(last_date.year)
-    m = int(last_date.month)
-    for _ in range(horizon):
-        m += 1
-        if m > 12:
-            m = 1
-            y += 1
-        labels.append(f"{y}-{NEXT_MONTHS_MAP[m]}")
-    return labels
+    # Aritmetika modular numpy menggantikan loop increment bulan/tahun
+    base = int(last_date.year) * 12 + int(last_date.month)
+    idx = base + np.arange(1, horizon + 1)
+    years = (idx - 1) // 12
+    months = (idx - 1) % 12 + 1
+    return [
+        f"{y}-{NEXT_MONTHS_MAP[m]}" for y, m in zip(years.tolist(), months.tolist())
+    ]
 
 
 def fit_trend_and_forecast(
     df_long: pd.DataFrame, horizon: int = 3
-) -> Tuple[pd.DataFrame, Dict[str, Dict[str, List[float]]]]:
+) -> Tuple[pd.DataFrame, Dict[str, Dict], Dict[str, pd.DataFrame]]:
     """
     Fit tren per kategori dan hasilkan ringkasan serta prediksi per kategori.
 
     Return:
       - summary_df: ringkasan metrik dan prediksi
       - detail_forecasts: dict kategori -> {'future_values': [...], 'future_labels': [...]}
+      - groups: dict kategori -> sub-frame time series (untuk plotting, agar
+        tidak perlu groupby ulang atas df_long)
     """
-    summaries = []
-    detail_forecasts: Dict[str, Dict[str, List[float]]] = {}
+    detail_forecasts: Dict[str, Dict] = {}
+    groups: Dict[str, pd.DataFrame] = {}
+
+    # Pivot butuh satu nilai per (kategori, bulan); duplikat (mis. file yang
+    # sama dimuat dua kali, atau satu --year dibroadcast ke banyak file)
+    # dilaporkan dengan jelas alih-alih error reshape pandas yang kabur.
+    dup_mask = df_long.duplicated(subset=["tipe_kendaraan", "tanggal"], keep=False)
+    if dup_mask.any():
+        dup = df_long.loc[dup_mask].iloc[0]
+        raise ValueError(
+            f"Terdapat lebih dari satu nilai untuk kategori '{dup['tipe_kendaraan']}' "
+            f"pada bulan {pd.Timestamp(dup['tanggal']):%Y-%m}. "
+            "Periksa daftar --input dan --year agar setiap kategori hanya punya satu nilai per bulan."
+        )
 
-    for tipe, grp in df_long.groupby("tipe_kendaraan", sort=False):
-        grp = grp.sort_values("tanggal")
-        y = grp["jumlah"].to_numpy(dtype=float)
-        n = len(y)
+    # Pivot ke matriks (kategori x waktu); kolom otomatis terurut kronologis.
+    wide = df_long.pivot(index="tipe_kendaraan", columns="tanggal", values="jumlah")
+    categories = list(wide.index)
+    dates = wide.columns
+    Y = wide.to_numpy(dtype=float)
+    K = len(categories)
+
+    # OLS closed-form untuk semua kategori sekaligus (tanpa loop fitting per
+    # kategori). Masker validitas menangani kategori dengan jumlah observasi
+    # berbeda; t per kategori tetap 1..n (peringkat kronologis baris valid),
+    # sama seperti fit per-grup sebelumnya.
+    valid = ~np.isnan(Y)
+    n_obs = valid.sum(axis=1)
+    T = np.cumsum(valid, axis=1) * valid  # posisi 1..n, 0 untuk sel kosong
+    Yv = np.where(valid, Y, 0.0)
+
+    n_safe = np.maximum(n_obs, 1)
+    t_mean = T.sum(axis=1) / n_safe
+    y_mean = Yv.sum(axis=1) / n_safe
+    t_dev = (T - t_mean[:, None]) * valid
+    Sxx = (t_dev**2).sum(axis=1)
+    Sxy = (t_dev * (Yv - y_mean[:, None])).sum(axis=1)
+    b_arr = np.where(Sxx > 0, Sxy / np.where(Sxx > 0, Sxx, 1.0), 0.0)
+    a_arr = np.where(n_obs > 0, y_mean - b_arr * t_mean, 0.0)
+
+    y_hat = a_arr[:, None] + b_arr[:, None] * T
+    ss_res = (((Yv - y_hat) ** 2) * valid).sum(axis=1)
+    ss_tot = (((Yv - y_mean[:, None]) ** 2) * valid).sum(axis=1)
+    r2_arr = np.where(
+        ss_tot > 0, 1.0 - ss_res / np.where(ss_tot > 0, ss_tot, 1.0), 1.0
+    )
+
+    # Prediksi: t = n+1..n+horizon untuk semua kategori sekaligus
+    future_t = n_obs[:, None] + np.arange(1, horizon + 1)[None, :]
+    preds_mat = a_arr[:, None] + b_arr[:, None] * future_t
+
+    # Indeks kolom terakhir yang valid per kategori (untuk last_actual/last_date)
+    last_idx = np.where(
+        n_obs > 0, Y.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1), 0
+    )
+    last_actuals = np.where(n_obs > 0, Y[np.arange(K), last_idx], np.nan)
 
-        if n < 2:
-            # Tidak cukup titik untuk tren linier
-            a, b, r2 = float(y.mean()) if n else 0.0, 0.0, 1.0
-        else:
-            a, b, r2 = _fit_linear_trend(y)
+    # Arah prediksi untuk semua kategori dalam satu np.select
+    next_preds = preds_mat[:, 0] if horizon > 0 else np.full(K, np.nan)
+    directions = _classify_directions_vec(last_actuals, next_preds)
 
-        preds = _predict_future(a, b, n, horizon) if horizon > 0 else []
-        last_actual = y[-1] if n > 0 else np.nan
-        direction = _classify_direction(last_actual, preds[0] if preds else np.nan)
+    labels_per_cat: List[List[str]] = []
+    # Umumnya semua kategori berakhir di bulan yang sama, jadi label cukup
+    # dihitung sekali per last_date unik
+    labels_cache: Dict[pd.Timestamp, List[str]] = {}
+    for k, tipe in enumerate(categories):
+        a, b = float(a_arr[k]), float(b_arr[k])
 
         # Simpan detail
-        last_date = grp["tanggal"].max()
-        future_labels = _month_labels_after(last_date, horizon)
+        last_date = dates[last_idx[k]]
+        future_labels = labels_cache.get(last_date)
+        if future_labels is None:
+            future_labels = _month_labels_after(last_date, horizon)
+            labels_cache[last_date] = future_labels
+        labels_per_cat.append(future_labels)
         detail_forecasts[tipe] = {
-            "future_values": preds,
+            "future_values": preds_mat[k].tolist(),
             "future_labels": future_labels,
+            "coef": (a, b),
         }
 
-        # Ringkasan
-        row = {
-            "tipe_kendaraan": tipe,
-            "n_obs": n,
-            "last_month_actual": (
-                float(last_actual) if not pd.isna(last_actual) else np.nan
-            ),
-            "slope_per_bulan": b,
-            "intercept": a,
-            "r2": r2,
-            "arah_prediksi_vs_bulan_terakhir": direction,
-        }
-        # Tambahkan kolom next_1..next_h
-        for i in range(horizon):
-            row[f"pred_next_{i+1}"] = preds[i] if i < len(preds) else np.nan
-            row[f"pred_next_{i+1}_label"] = (
-                future_labels[i] if i < len(future_labels) else ""
-            )
-        summaries.append(row)
-
-    summary_df = pd.DataFrame(summaries)
-    # Urutkan: Total di atas jika ada
-    if "Total" in summary_df["tipe_kendaraan"].values:
-        summary_df["__order"] = (summary_df["tipe_kendaraan"] != "Total").astype(int)
-        summary_df = summary_df.sort_values(["__order", "tipe_kendaraan"]).drop(
-            columns="__order"
+        # Sub-frame time series dari baris pivot (sel valid saja), supaya
+        # tahap plotting tidak perlu menggroupby df_long lagi
+        mask = valid[k]
+        groups[tipe] = pd.DataFrame(
+            {
+                "tipe_kendaraan": tipe,
+                "tanggal": dates[mask],
+                "jumlah": Y[k, mask],
+            }
         )
-    else:
-        summary_df = summary_df.sort_values("tipe_kendaraan")
 
-    return summary_df, detail_forecasts
+    # Ringkasan langsung dari array kolom (tanpa inferensi skema per baris)
+    summary_df = pd.DataFrame(
+        {
+            "tipe_kendaraan": categories,
+            "n_obs": n_obs,
+            "last_month_actual": last_actuals,
+            "slope_per_bulan": b_arr,
+            "intercept": a_arr,
+            "r2": r2_arr,
+            "arah_prediksi_vs_bulan_terakhir": directions,
+        }
+    )
+    # Tambahkan kolom next_1..next_h
+    for i in range(horizon):
+        summary_df[f"pred_next_{i+1}"] = preds_mat[:, i]
+        summary_df[f"pred_next_{i+1}_label"] = [lab[i] for lab in labels_per_cat]
+    # Urutkan: Total di atas jika ada. Categorical terurut menggantikan
+    # kolom bantu __order + sort ganda.
+    ordered = (["Total"] if "Total" in categories else []) + sorted(
+        c for c in categories if c != "Total"
+    )
+    summary_df["tipe_kendaraan"] = pd.Categorical(
+        summary_df["tipe_kendaraan"], categories=ordered, ordered=True
+    )
+    summary_df = summary_df.sort_values("tipe_kendaraan")
+
+    return summary_df, detail_forecasts, groups
 
 
-def plot_category(
-    grp: pd.DataFrame, preds: List[float], preds_labels: List[str], out_dir: str
+_FIG_AX: Optional[tuple] = None
+
+
+def _get_fig_ax():
+    """
+    Figure/Axes yang dipakai ulang antar kategori (satu per proses worker).
+    Menghindari konstruksi figure + tight_layout per plot. Import
+    matplotlib/seaborn ditunda ke sini; gaya di-set sekali per proses
+    bersamaan dengan pembuatan skeleton.
+    """
+    global _FIG_AX
+    if _FIG_AX is None:
+        import matplotlib
+
+        # Backend non-interaktif: aman untuk render paralel tanpa GUI
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
+        # sns.set() menulis ulang rcParams global dan mahal jika diulang
+        # per plot
+        sns.set(style="whitegrid")
+        fig, ax = plt.subplots(figsize=(9, 4.5))
+        # Margin kiri cukup lebar untuk label sumbu-y + tick 5 digit
+        fig.subplots_adjust(left=0.12, right=0.98, top=0.92, bottom=0.12)
+        _FIG_AX = (fig, ax)
+    return _FIG_AX
+
+
+def _render_and_save(
+    tipe: str,
+    tanggal: np.ndarray,
+    jumlah: np.ndarray,
+    preds: List[float],
+    preds_labels: List[str],
+    out_dir: str,
+    coef: Optional[Tuple[float, float]] = None,
 ) -> None:
     """
-    Plot historis dan tren linier dengan titik prediksi ke depan.
+    Render satu kategori ke PNG dari array polos (picklable murah untuk
+    dikirim ke proses worker). Jika coef=(a, b) diberikan (hasil
+    fit_trend_and_forecast), garis tren dihitung dari koefisien tersebut
+    tanpa fitting ulang.
     """
     os.makedirs(out_dir, exist_ok=True)
-    tipe = grp["tipe_kendaraan"].iloc[0]
     safe_name = _sanitize_filename(tipe)
 
-    # Data untuk fitting ulang garis tren agar visual selaras
-    y = grp["jumlah"].to_numpy(dtype=float)
+    # Garis tren dari koefisien cache, atau fit ulang bila tidak tersedia
+    y = np.asarray(jumlah, dtype=float)
     n = len(y)
-    if n >= 2:
+    t_all = np.arange(1, n + 1)
+    if coef is not None:
+        a, b = coef
+        y_hat = a + b * t_all
+    elif n >= 2:
         a, b, _ = _fit_linear_trend(y)
-        t_all = np.arange(1, n + 1)
         y_hat = a + b * t_all
     else:
-        t_all = np.arange(1, n + 1)
         y_hat = y.copy()
 
-    # Plot
-    sns.set(style="whitegrid")
-    plt.figure(figsize=(9, 4.5))
+    # Plot pada Axes yang dipakai ulang
+    fig, ax = _get_fig_ax()
     # Garis aktual
-    plt.plot(grp["tanggal"], grp["jumlah"], marker="o", label="Aktual")
+    ax.plot(tanggal, y, marker="o", label="Aktual")
     # Garis tren (di atas domain aktual)
     if n >= 1:
-        plt.plot(grp["tanggal"], y_hat, linestyle="--", color="C1", label="Tren linier")
+        ax.plot(tanggal, y_hat, linestyle="--", color="C1", label="Tren linier")
 
     # Titik prediksi
     if preds:
         # Buat sumbu waktu untuk prediksi melanjutkan dari bulan terakhir
-        last_date = grp["tanggal"].max()
-        future_dates = []
-        y_val = last_date.year
-        m_val = last_date.month
-        for _ in preds:
-            m_val += 1
-            if m_val > 12:
-                m_val = 1
-                y_val += 1
-            future_dates.append(pd.Timestamp(year=y_val, month=m_val, day=1))
-
-        plt.plot(
+        # (satu date_range, tanpa konstruksi Timestamp per iterasi)
+        last_date = pd.Timestamp(tanggal[-1])
+        future_dates = pd.date_range(
+            last_date + pd.offsets.MonthBegin(1), periods=len(preds), freq="MS"
+        )
+
+        ax.plot(
             future_dates,
             preds,
             marker="x",
@@ -385,7 +534,7 @@ def plot_category(
 
         # Anotasi label ringkas di tiap titik prediksi
         for d, val, lab in zip(future_dates, preds, preds_labels):
-            plt.annotate(
+            ax.annotate(
                 lab,
                 (d, val),
                 textcoords="offset points",
@@ -395,15 +544,36 @@ def plot_category(
                 color="C3",
             )
 
-    plt.title(f"Tren & Prediksi: {tipe}")
-    plt.xlabel("Bulan")
-    plt.ylabel("Jumlah Penumpang")
-    plt.legend()
-    plt.tight_layout()
+    ax.set_title(f"Tren & Prediksi: {tipe}")
+    ax.set_xlabel("Bulan")
+    ax.set_ylabel("Jumlah Penumpang")
+    ax.legend()
 
     out_path = os.path.join(out_dir, f"{safe_name}.png")
-    plt.savefig(out_path, dpi=150)
-    plt.close()
+    fig.savefig(out_path, dpi=150)
+    ax.clear()
+
+
+def plot_category(
+    grp: pd.DataFrame,
+    preds: List[float],
+    preds_labels: List[str],
+    out_dir: str,
+    coef: Optional[Tuple[float, float]] = None,
+) -> None:
+    """
+    Plot historis dan tren linier dengan titik prediksi ke depan.
+    Wrapper di atas _render_and_save untuk pemanggilan dengan sub-frame.
+    """
+    _render_and_save(
+        str(grp["tipe_kendaraan"].iloc[0]),
+        grp["tanggal"].to_numpy(),
+        grp["jumlah"].to_numpy(dtype=float),
+        preds,
+        preds_labels,
+        out_dir,
+        coef,
+    )
 
 
 def run(
@@ -412,32 +582,56 @@ def run(
     horizon: int,
     years: Optional[List[int]] = None,
     default_year: Optional[int] = None,
-) -> Tuple[pd.DataFrame, Dict[str, Dict[str, List[float]]]]:
+    use_cache: bool = False,
+) -> Tuple[pd.DataFrame, Dict[str, Dict]]:
     """
     Pipeline end-to-end untuk satu atau banyak file input.
+    use_cache=True mengaktifkan cache parquet di output_dir untuk run
+    berulang atas input yang sama.
     """
     os.makedirs(output_dir, exist_ok=True)
     plots_dir = os.path.join(output_dir, "plots")
     os.makedirs(plots_dir, exist_ok=True)
 
     df_long = load_and_transform_multi(
-        paths=inputs, years=years, default_year=default_year
+        paths=inputs,
+        years=years,
+        default_year=default_year,
+        cache_dir=output_dir if use_cache else None,
     )
-    summary_df, detail = fit_trend_and_forecast(df_long, horizon=horizon)
+    summary_df, detail, groups = fit_trend_and_forecast(df_long, horizon=horizon)
 
     # Simpan ringkasan
     out_csv = os.path.join(output_dir, "forecast_summary.csv")
-    # Bulatkan angka untuk keterbacaan
-    to_save = summary_df.copy()
-    num_cols = to_save.select_dtypes(include=[np.number]).columns
-    to_save[num_cols] = to_save[num_cols].round(2)
-    to_save.to_csv(out_csv, index=False, encoding="utf-8")
-
-    # Plot per kategori
-    for tipe, grp in df_long.groupby("tipe_kendaraan", sort=False):
-        preds = detail[tipe]["future_values"]
-        labels = detail[tipe]["future_labels"]
-        plot_category(grp, preds, labels, plots_dir)
+    # Bulatkan angka untuk keterbacaan, difusikan ke tahap tulis: round
+    # langsung atas kolom Arrow, tanpa copy + pass round pandas terpisah.
+    # Penulisan CSV native (multi-threaded) via pyarrow.
+    table = pa.Table.from_pandas(summary_df, preserve_index=False)
+    for idx, field in enumerate(table.schema):
+        if pa.types.is_floating(field.type):
+            table = table.set_column(
+                idx, field, pc.round(table.column(idx), ndigits=2)
+            )
+    pacsv.write_csv(table, out_csv)
+
+    # Plot per kategori (paralel: konstruksi figure + encoding PNG
+    # independen antar kategori). Payload ke worker berupa array polos,
+    # bukan DataFrame, agar pickling murah.
+    tasks = [
+        (
+            tipe,
+            grp["tanggal"].to_numpy(),
+            grp["jumlah"].to_numpy(dtype=float),
+            detail[tipe]["future_values"],
+            detail[tipe]["future_labels"],
+            plots_dir,
+            detail[tipe]["coef"],
+        )
+        for tipe, grp in groups.items()
+    ]
+    Parallel(n_jobs=-1, backend="loky")(
+        delayed(_render_and_save)(*task) for task in tasks
+    )
 
     return summary_df, detail
 
@@ -498,6 +692,11 @@ def parse_args() -> argparse.Namespace:
         type=int,
         help="Tahun data untuk masing-masing --input (boleh diulang). Jika tidak diisi, akan coba diinfer dari nama file, lalu fallback ke --default_year.",
     )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Cache hasil transformasi ke parquet di output_dir (kunci: mtime+ukuran file), mempercepat run berulang.",
+    )
     parser.add_argument(
         "--default_year",
         type=int,
@@ -529,6 +728,7 @@ def main() -> None:
         horizon=args.horizon,
         years=years,
         default_year=args.default_year,
+        use_cache=args.cache,
     )
     _print_console_summary(summary_df, args.horizon)
 